@@ -1,9 +1,13 @@
-from collections import Counter, defaultdict
+from array import array
+from collections import Counter, defaultdict, namedtuple
+from types import MappingProxyType
 from tabulate import tabulate
+import threading
 import json
 import os
 import math
 
+import numpy
 from merakicommons.ghost import GhostLoadingRequiredError
 import cassiopeia as cass
 from cassiopeia.data import Map
@@ -13,6 +17,42 @@ buildcalculator_director = os.path.dirname(os.path.realpath(__file__))
 _fields = json.load(open(os.path.join(buildcalculator_director, 'fields.json')))
 _basic_fields = json.load(open(os.path.join(buildcalculator_director, 'basic_fields.json')))
 
+# The (flat, percent, per_level, percent_per_level, percent_base, percent_bonus) fields of each stat in _basic_fields, in order
+_component_fields = [name.format(attr) for attr in _basic_fields
+                     for name in ('{0}', 'percent_{0}', '{0}_per_level', 'percent_{0}_per_level', 'percent_base_{0}', 'percent_bonus_{0}')]
+_basic_field_index = {attr: i for i, attr in enumerate(_basic_fields)}
+_all_component_columns = list(range(len(_component_fields)))
+
+# The columns of a stat table: the components first, so that they can be read as one block without copying, then the rest
+# of _fields. The components that aren't in _fields are always zero.
+_table_fields = _component_fields + [attr for attr in _fields if attr not in set(_component_fields)]
+_field_columns = {attr: _table_fields.index(attr) for attr in _fields}
+
+# A mastery has one row in its registry's stat table for each possible number of points, from 0 to 5
+_max_mastery_points = 5
+
+# The number of Builds that Build._batch_totals evaluates at a time, which bounds the size of its temporary arrays
+_batch_size = 512
+
+# Guards the class-level registries. Each _init_* function builds its registry under this lock and publishes it with a
+# single assignment of an immutable _Registry, so a reader always sees one complete registry, never a mix of two loads.
+_registry_lock = threading.RLock()
+
+_Registry = namedtuple('_Registry', ['by_id', 'by_name', 'stats'])
+_ItemRegistry = namedtuple('_ItemRegistry', _Registry._fields + ('stat_gold_values', 'gold_values', 'gold_efficiencies'))
+
+
+def _load_once(cls, attr, init, *args):
+    """Returns the registry stored in cls.attr, calling init(*args) to load it first if it is not loaded. Concurrent first use only loads it once."""
+    registry = getattr(cls, attr)
+    if registry is None:
+        with _registry_lock:
+            registry = getattr(cls, attr)
+            if registry is None:
+                init(*args)
+                registry = getattr(cls, attr)
+    return registry
+
 
 class DefaultCounter(defaultdict, Counter):
     pass
@@ -22,6 +62,39 @@ class BuildError(Exception):
     pass
 
 
+class _StatTable(object):
+    """The stats of a registry's objects as one flat, read-only table of doubles: a row per object and a column per stat in _table_fields."""
+
+    def __init__(self, values):
+        """@param values:  A read-only memoryview of doubles (format 'd'), such as one cast from a shared memory block."""
+        self.values = values
+
+        # The table as a 2D numpy view of values (not a copy), and the stat components of each row: its first len(_component_fields) columns
+        self.rows = numpy.frombuffer(values, dtype=numpy.float64).reshape(-1, len(_table_fields))
+        self.components = self.rows[:, :len(_component_fields)]
+
+    def get(self, row, attr):
+        return self.values[row * len(_table_fields) + _field_columns[attr]]
+
+    def __len__(self):  # The number of rows
+        return len(self.values) // len(_table_fields)
+
+    @staticmethod
+    def compile(objects):
+        """Builds the table for a registry's objects and points each object at its first row."""
+        values = array('d')
+        rows = []
+        for obj in objects:
+            rows.append(len(values) // len(_table_fields))
+            for row in obj._stat_rows():
+                values.extend(row)
+        table = _StatTable(memoryview(values).toreadonly())
+        for obj, row in zip(objects, rows):
+            obj._stat_table = table
+            obj._stat_row = row
+        return table
+
+
 class _BuildObject(object):
     def __init__(self, riot_obj, dictionary=None, default=0.0):
         self.id = riot_obj.id
@@ -33,7 +106,7 @@ class _BuildObject(object):
                     value = getattr(riot_obj.stats, attr, default)
                 except KeyError:
                     value = default
-                setattr(self, attr, default)
+                setattr(self, attr, value)
         else:
             for attr in _fields:
                 setattr(self, attr, default)
@@ -47,6 +120,21 @@ class _BuildObject(object):
         self.percent_base_attack_speed = self.percent_attack_speed + self.percent_base_attack_speed
         self.percent_attack_speed = default
 
+    def __getattr__(self, attr):  # Only called for stats that aren't set on the object, such as for objects created by _from_metadata
+        table = self.__dict__.get('_stat_table')
+        if table is None or attr not in _field_columns:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(self.__class__.__name__, attr))
+        return table.get(self._stat_row, attr)
+
+    def __getstate__(self):  # The stat table can't be pickled, so the object's stats are pickled instead
+        state = dict(self.__dict__)
+        if state.pop('_stat_table', None) is not None:
+            del state['_stat_row']
+            for attr in _fields:
+                if attr not in state:
+                    state[attr] = getattr(self, attr)
+        return state
+
     def __eq__(self, other):
         return self.id == other.id
 
@@ -56,6 +144,23 @@ class _BuildObject(object):
     def __str__(self):
         return self.name
 
+    def _stat_rows(self):
+        """Returns this object's rows of the stat table."""
+        return [[float(getattr(self, attr, 0.0) or 0.0) for attr in _table_fields]]
+
+    def _metadata(self):
+        """Returns everything about this object except its stats, as picklable values."""
+        return {'id': self.id, 'name': self.name}
+
+    @classmethod
+    def _from_metadata(cls, metadata, table, row):
+        """Creates an object that reads its stats from row of table instead of storing them."""
+        obj = cls.__new__(cls)
+        obj.__dict__.update(metadata)
+        obj._stat_table = table
+        obj._stat_row = row
+        return obj
+
 
 class Champion(_BuildObject):
     pass
@@ -73,21 +178,50 @@ class _Mastery(_BuildObject):
         super().__init__(riot_mastery, dictionary=data, default=DefaultCounter(float))
         self.tree = riot_mastery.tree
 
+    def __getattr__(self, attr):  # Returns the (num_points, value) dictionary of a stat for masteries created by _from_metadata
+        table = self.__dict__.get('_stat_table')
+        if table is None or attr not in _field_columns:
+            raise AttributeError("'{0}' object has no attribute '{1}'".format(self.__class__.__name__, attr))
+        return {points: table.get(self._stat_row + points, attr) for points in range(_max_mastery_points + 1)}
+
+    def _freeze(self):
+        """Replace the (num_points, value) counters with plain dictionaries, so looking up missing points can't insert them."""
+        for attr in _fields:
+            setattr(self, attr, dict(getattr(self, attr)))
+
+    def _stat_rows(self):
+        return [[float(getattr(self, attr, {}).get(points, 0.0)) for attr in _table_fields] for points in range(_max_mastery_points + 1)]
+
+    def _metadata(self):
+        metadata = super()._metadata()
+        metadata['tree'] = self.tree
+        return metadata
+
 
 class Mastery(_Mastery):
+    __getattr__ = _BuildObject.__getattr__
+
     def __init__(self, mastery, points):
+        if not 0 <= points <= _max_mastery_points:
+            raise BuildError("A mastery can have at most {0} points.".format(_max_mastery_points))
         self.id = mastery.id
         self.name = mastery.name
         self.points = points
         self.tree = mastery.tree
+        self._stat_table = mastery._stat_table
+        self._stat_row = mastery._stat_row + points
         for attr in _fields:
-            setattr(self, attr, getattr(mastery, attr)[points])
+            setattr(self, attr, self._stat_table.get(self._stat_row, attr))
 
 
 class Rune(_BuildObject):
     pass
 
 
+# The gold fields of a cassiopeia item, which an item recreated from published metadata holds instead
+_Gold = namedtuple('_Gold', ['base', 'purchaseable', 'sell', 'total'])
+
+
 class Item(_BuildObject):
     def __init__(self, riot_obj, dictionary=None, default=0.0):
         super().__init__(riot_obj, dictionary, default)
@@ -98,39 +232,80 @@ class Item(_BuildObject):
             self.builds_from = []
         self.tags = riot_obj.tags
 
+    def _metadata(self):
+        metadata = super()._metadata()
+        metadata['gold'] = _Gold._make(getattr(self.gold, field) for field in _Gold._fields)
+        metadata['builds_from'] = [item.id for item in self.builds_from]
+        metadata['tags'] = list(self.tags)
+        return metadata
+
+    @classmethod
+    def _from_metadata(cls, metadata, table, row):
+        """The item's builds_from holds item IDs until they are resolved with _resolve_builds_from."""
+        item = super()._from_metadata(metadata, table, row)
+        item.gold = metadata['gold']
+        return item
+
+    def _resolve_builds_from(self, items_by_id):
+        """Replaces the item IDs in builds_from with the items in items_by_id, leaving out IDs that aren't in it."""
+        self.builds_from = [items_by_id[id_] for id_ in self.builds_from if id_ in items_by_id]
+
     @property
     def enchanted_name(self):
         return '{} ({})'.format(self.name, ', '.join(item.name for item in self.builds_from))
 
+    @property
+    def gold_value(self):
+        """Returns the gold value of the item's stats, priced using the basic items in the item registry."""
+        return ItemSet._registry().gold_values.get(self.id, 0.0)
+
+    @property
+    def gold_efficiency(self):
+        """Returns the gold value of the item's stats divided by the item's total cost."""
+        return ItemSet._registry().gold_efficiencies.get(self.id, 0.0)
+
 
 class MasteryPage(defaultdict):
-    _masteries_by_id = None
-    _masteries_by_name = None
+    _masteries = None
 
     def __init__(self, masteries=None, all_masteries=None):
         """@param masteries:  A dictionary of of (mastery_id, num_points) pairs. Defaults to an empty dictionary."""
 
-        if not MasteryPage._masteries_by_id:
-            MasteryPage._init_masteries(all_masteries)
+        MasteryPage._registry(all_masteries)
         super().__init__(bool)
         self.update(masteries or {})
         self._check_page_viability()
 
-    def _init_masteries(all_masteries):
-        if not all_masteries:
-            riotapi_masteries = {mastery.id: mastery for mastery in cass.get_masteries()}
-
-            all_masteries = json.load(open(os.path.join(buildcalculator_director, 'masteries.json')))
-            all_masteries = {int(id_): data for id_, data in all_masteries.items()}
-            for id_, m in all_masteries.items():
-                for key, values in m.items():
-                    if key != 'tree' and key != 'name':
-                        m[key] = {int(i): data for i, data in values.items()}
-        else:
-            MasteryPage._masteries_by_id = all_masteries
-
-        MasteryPage._masteries_by_id = {id_: _Mastery(riotapi_masteries[id_], data) for id_, data in all_masteries.items()}
-        MasteryPage._masteries_by_name = {mastery.name: mastery for _, mastery in MasteryPage._masteries_by_id.items()}
+    @staticmethod
+    def _registry(all_masteries=None):
+        """Returns the mastery registry, loading it on first use."""
+        return _load_once(MasteryPage, '_masteries', MasteryPage._init_masteries, all_masteries)
+
+    def _init_masteries(all_masteries=None, stats=None):
+        """@param stats:  The stat table the masteries in all_masteries already read from. Defaults to compiling a new one."""
+        with _registry_lock:
+            if all_masteries is None:
+                riotapi_masteries = {mastery.id: mastery for mastery in cass.get_masteries()}
+
+                all_masteries = json.load(open(os.path.join(buildcalculator_director, 'masteries.json')))
+                all_masteries = {int(id_): data for id_, data in all_masteries.items()}
+                for id_, m in all_masteries.items():
+                    for key, values in m.items():
+                        if key != 'tree' and key != 'name':
+                            m[key] = {int(i): data for i, data in values.items()}
+                masteries_by_id = {id_: _Mastery(riotapi_masteries[id_], data) for id_, data in all_masteries.items()}
+            else:
+                masteries_by_id = dict(all_masteries)
+
+            if stats is None:
+                for _, mastery in masteries_by_id.items():
+                    mastery._freeze()
+                stats = _StatTable.compile(list(masteries_by_id.values()))
+            MasteryPage._masteries = _Registry(
+                by_id=MappingProxyType(masteries_by_id),
+                by_name=MappingProxyType({mastery.name: mastery for _, mastery in masteries_by_id.items()}),
+                stats=stats,
+            )
 
     def _check_page_viability(self):
         if not sum(mastery.points for mastery in self.keys()) <= 30:
@@ -174,32 +349,44 @@ class MasteryPage(defaultdict):
 
     @staticmethod
     def _get_mastery(mastery):
+        masteries = MasteryPage._registry()
         if isinstance(mastery, str):
-            mastery = MasteryPage._masteries_by_name[mastery]
+            mastery = masteries.by_name[mastery]
         elif isinstance(mastery, int):
-            mastery = MasteryPage._masteries_by_id[mastery]
-        return MasteryPage._masteries_by_id[mastery.id]
+            mastery = masteries.by_id[mastery]
+        return masteries.by_id[mastery.id]
 
 
 class RunePage(defaultdict):
-    _runes_by_id = None
-    _runes_by_name = None
+    _runes = None
 
     def __init__(self, runes=None, all_runes=None):
         """@param runes:  A dictionary of of (rune_id, point) or (rune_name, point) key/value pairs. Defaults to an empty dictionary."""
-        if not RunePage._runes_by_id:
-            RunePage._init_runes(all_runes)
+        RunePage._registry(all_runes)
         super().__init__(bool)
         self.update(runes or {})
 
-    def _init_runes(all_runes=None):
-        if not all_runes:
-            all_runes = {rune.id: rune for rune in cass.get_runes()}
-            RunePage._runes_by_id = {id_: Rune(data) for id_, data in all_runes.items()}
-        else:
-            RunePage._runes_by_id = all_runes
+    @staticmethod
+    def _registry(all_runes=None):
+        """Returns the rune registry, loading it on first use."""
+        return _load_once(RunePage, '_runes', RunePage._init_runes, all_runes)
+
+    def _init_runes(all_runes=None, stats=None):
+        """@param stats:  The stat table the runes in all_runes already read from. Defaults to compiling a new one."""
+        with _registry_lock:
+            if all_runes is None:
+                all_runes = {rune.id: rune for rune in cass.get_runes()}
+                runes_by_id = {id_: Rune(data) for id_, data in all_runes.items()}
+            else:
+                runes_by_id = dict(all_runes)
 
-        RunePage._runes_by_name = {rune.name: rune for _, rune in RunePage._runes_by_id.items()}
+            if stats is None:
+                stats = _StatTable.compile(list(runes_by_id.values()))
+            RunePage._runes = _Registry(
+                by_id=MappingProxyType(runes_by_id),
+                by_name=MappingProxyType({rune.name: rune for _, rune in runes_by_id.items()}),
+                stats=stats,
+            )
 
     def update(self, runes):
         """@param runes:  A dictionary of (rune_id, point) or (rune_name, point) pairs."""
@@ -212,36 +399,86 @@ class RunePage(defaultdict):
 
     @staticmethod
     def _get_rune(rune):
+        runes = RunePage._registry()
         if isinstance(rune, str):
-            rune = RunePage._runes_by_name[rune]
+            rune = runes.by_name[rune]
         elif isinstance(rune, int):
-            rune = RunePage._runes_by_id[rune]
+            rune = runes.by_id[rune]
         assert isinstance(rune, Rune)
         return rune
 
 
 class ItemSet(list):
-    _items_by_id = None
-    _items_by_name = None
+    _items = None
 
     def __init__(self, items=None, all_items=None):
         """@param items:  A list of item IDs or item names. Defaults to an empty list."""
 
-        if not ItemSet._items_by_id:
-            ItemSet._init_items(all_items)
+        ItemSet._registry(all_items)
 
         super().__init__()
         self._trinket_index = None
         self.overwrite(items or [])
 
-    def _init_items(all_items=None):
-        if not all_items:
-            all_items = cass.get_items()
-            ItemSet._items_by_id = {item.id: Item(item) for item in all_items if Map.summoners_rift in item.maps}
-        else:
-            ItemSet._items_by_id = all_items
+    @staticmethod
+    def _registry(all_items=None):
+        """Returns the item registry, loading it on first use."""
+        return _load_once(ItemSet, '_items', ItemSet._init_items, all_items)
+
+    def _init_items(all_items=None, stats=None):
+        """@param stats:  The stat table the items in all_items already read from. Defaults to compiling a new one."""
+        with _registry_lock:
+            if all_items is None:
+                all_items = cass.get_items()
+                items_by_id = {item.id: Item(item) for item in all_items if Map.summoners_rift in item.maps}
+            else:
+                items_by_id = dict(all_items)
+
+            if stats is None:
+                stats = _StatTable.compile(list(items_by_id.values()))
+            stat_gold_values, gold_values, gold_efficiencies = ItemSet._init_gold_values(items_by_id, stats)
+            ItemSet._items = _ItemRegistry(
+                by_id=MappingProxyType(items_by_id),
+                by_name=MappingProxyType({item.name: item for _, item in items_by_id.items()}),
+                stats=stats,
+                stat_gold_values=MappingProxyType(stat_gold_values),
+                gold_values=MappingProxyType(gold_values),
+                gold_efficiencies=MappingProxyType(gold_efficiencies),
+            )
+
+    def _init_gold_values(items_by_id, stats):
+        """Prices one point of each stat using the basic items (no components, a single stat) in items_by_id, then scores every item with those prices.
+
+        @param stats:  The stat table the items in items_by_id read from.
+        """
+        items = list(items_by_id.values())
+        values = stats.rows[numpy.array([item._stat_row for item in items], dtype=numpy.intp)][:, [_field_columns[attr] for attr in _fields]]
+        costs = numpy.array([item.gold.total for item in items], dtype=numpy.float64)
+
+        # If several basic items give the same stat, the cheapest price per point is the reference
+        basic = (numpy.count_nonzero(values, axis=1) == 1) & (costs > 0) & numpy.array([not item.builds_from for item in items], dtype=bool)
+        basic_rows, basic_columns = numpy.nonzero(values[basic])
+        prices = numpy.full(len(_fields), numpy.inf)
+        numpy.minimum.at(prices, basic_columns, costs[basic][basic_rows] / values[basic][basic_rows, basic_columns])
+        priced_columns = numpy.flatnonzero(numpy.isfinite(prices))
 
-        ItemSet._items_by_name = {item.name: item for _, item in ItemSet._items_by_id.items()}
+        # Each item's gold value is the dot product of its stats and the prices, and its efficiency is that divided by its cost
+        gold_values = values[:, priced_columns] @ prices[priced_columns]
+        gold_efficiencies = numpy.divide(gold_values, costs, out=numpy.zeros(len(items)), where=costs > 0)
+
+        stat_gold_values = {_fields[column]: price for column, price in zip(priced_columns.tolist(), prices[priced_columns].tolist())}
+        ids = [item.id for item in items]
+        return stat_gold_values, dict(zip(ids, gold_values.tolist())), dict(zip(ids, gold_efficiencies.tolist()))
+
+    @staticmethod
+    def stat_gold_values():
+        """Returns a dictionary of (stat, gold per point) pairs derived from the basic items."""
+        return dict(ItemSet._registry().stat_gold_values)
+
+    @staticmethod
+    def gold_efficiencies():
+        """Returns a dictionary of (item_id, gold efficiency) pairs for every item in the registry."""
+        return dict(ItemSet._registry().gold_efficiencies)
 
     @staticmethod
     def _get_item(item):
@@ -249,9 +486,9 @@ class ItemSet(list):
             if ' - ' in item:
                 item = ItemSet.get_enchanted_item_by_name(item)
             else:
-                item = ItemSet._items_by_name[item]
+                item = ItemSet._registry().by_name[item]
         elif isinstance(item, int):
-            item = ItemSet._items_by_id[item]
+            item = ItemSet._registry().by_id[item]
         return item
 
     def remove(self, item):
@@ -301,8 +538,9 @@ class ItemSet(list):
 
         item_name, enchantment = enchanted_item_name.split(' - ')
         if isinstance(enchantment, str):
-            item = self._items_by_name[item_name]
-            for _, _item in self._items_by_id.items():
+            items = ItemSet._registry()
+            item = items.by_name[item_name]
+            for _, _item in items.by_id.items():
                 if enchantment in _item.name:
                     if item.id in [component.id for component in _item.builds_from]:
                         return _item
@@ -314,10 +552,21 @@ class ItemSet(list):
         """Returns the total cost of the items."""
         return sum(item.gold.total for item in self)
 
+    @property
+    def gold_value(self):
+        """Returns the total gold value of the items' stats."""
+        gold_values = ItemSet._registry().gold_values
+        return sum(gold_values.get(item.id, 0.0) for item in self)
+
+    @property
+    def gold_efficiency(self):
+        """Returns the gold value of the items' stats divided by the total cost of the items."""
+        cost = self.cost
+        return self.gold_value / cost if cost > 0 else 0.0
+
 
 class Build(object):
-    _champions_by_id = None
-    _champions_by_name = None
+    _champions = None
 
     def __init__(self, champion=None, level=1, item_set=None, rune_page=None, mastery_page=None):
         """@param champion:     A champion ID or name.
@@ -327,8 +576,7 @@ class Build(object):
         @param mastery_page: The rune page or a dictionary of (mastery_id/mastery_name, num_points) pairs.
         """
 
-        if not Build._champions_by_id:
-            Build._init_champions()
+        Build._registry()
 
         if champion is None:
             raise TypeError("Build.__init__() missing 1 required positional argument: 'champion'")
@@ -398,12 +646,27 @@ class Build(object):
         """Returns the total cost of the items in the build."""
         return self.item_set.cost
 
-    def _init_champions(all_champions=None):
-        if not all_champions:
-            all_champions = cass.get_champions()
-            Build._champions_by_id = {champion.id: Champion(champion) for champion in all_champions}
+    @staticmethod
+    def _registry(all_champions=None):
+        """Returns the champion registry, loading it on first use."""
+        return _load_once(Build, '_champions', Build._init_champions, all_champions)
+
+    def _init_champions(all_champions=None, stats=None):
+        """@param stats:  The stat table the champions in all_champions already read from. Defaults to compiling a new one."""
+        with _registry_lock:
+            if all_champions is None:
+                all_champions = cass.get_champions()
+                champions_by_id = {champion.id: Champion(champion) for champion in all_champions}
+            else:
+                champions_by_id = dict(all_champions)
 
-        Build._champions_by_name = {champion.name: champion for _, champion in Build._champions_by_id.items()}
+            if stats is None:
+                stats = _StatTable.compile(list(champions_by_id.values()))
+            Build._champions = _Registry(
+                by_id=MappingProxyType(champions_by_id),
+                by_name=MappingProxyType({champion.name: champion for _, champion in champions_by_id.items()}),
+                stats=stats,
+            )
 
     def set_level(self, level):
         """@param level:  Sets the champion's level. An int between 1 and 18 is accepted."""
@@ -415,16 +678,17 @@ class Build(object):
     def set_champion(self, champion):
         """@param champion:  Sets the champion for the Build. A name, id, or Cassiopeia Champion is accepted."""
 
+        champions = Build._registry()
         _champion = champion
         if isinstance(_champion, str):
-            _champion = self._champions_by_name[_champion].id
+            _champion = champions.by_name[_champion].id
         if not isinstance(_champion, int):
             _champion = _champion.id
 
-        if _champion not in self._champions_by_id.keys():
+        if _champion not in champions.by_id.keys():
             raise BuildError('Invalid champion name, id, or Cassiopeia Champion: {0}.'.format(champion))
 
-        self._champion = self._champions_by_id[_champion]
+        self._champion = champions.by_id[_champion]
 
     def set_items(self, item_set):
         """@param item_set:  Sets the items for the build. Should be a list of item names, ids, or Cassiopeia Items."""
@@ -459,6 +723,7 @@ class Build(object):
     @property
     def _objects(self):
         return self.item_set + [rune for rune, count in self.rune_page.items() for i in range(count)] + [mastery for mastery, points in self.mastery_page.items()]
+
     def total(self, attr):
         """Returns the total value for the attribute."""
 
@@ -469,7 +734,6 @@ class Build(object):
         total_percent_per_level = 0.0
         total_percent_base = 0.0
         total_percent_bonus = 0.0
-        base = self.base(attr)
         for obj in self._objects:
             flat, percent, per_level, percent_per_level, percent_base, percent_bonus = Build._get_object_stat(obj, attr)
             total_flat += flat
@@ -478,9 +742,97 @@ class Build(object):
             total_percent_per_level += percent_per_level
             total_percent_base += percent_base
             total_percent_bonus += percent_bonus
-        total = ( (base * (1.0 + total_percent_base)) + total_flat + total_per_level*self._level ) * (1.0 + total_percent + total_percent_per_level*self._level)
-        bonus = total - self.base(attr)
-        total += total_percent_bonus * bonus
+        sums = (total_flat, total_percent, total_per_level, total_percent_per_level, total_percent_base, total_percent_bonus)
+        return Build._total_from_sums(self.base(attr), sums, self._level)
+
+    def totals(self, attrs=None):
+        """@param attrs:  A list of stats from _basic_fields. Defaults to all of them.
+
+        Returns a dictionary of (stat, total value) pairs, calculated for all of the stats at once with array operations.
+        """
+        return Build._batch_totals([self], attrs)[0]
+
+    def _batch_totals(builds, attrs=None):
+        """@param builds:  A list of Builds.
+        @param attrs:   A list of stats from _basic_fields. Defaults to all of them.
+
+        Returns a list with a dictionary of (stat, total value) pairs for each Build. The Builds are evaluated _batch_size at a time:
+        their objects' rows are gathered in Python, and then the stats are summed and combined with whole-array numpy operations.
+        """
+        attrs = list(attrs or _basic_fields)
+        for attr in attrs:
+            if attr not in _basic_field_index:
+                raise KeyError("'{0}'".format(attr))
+        columns = [6 * _basic_field_index[attr] + j for attr in attrs for j in range(6)]
+
+        totals = []
+        for start in range(0, len(builds), _batch_size):
+            batch = builds[start:start + _batch_size]
+            # Arrays of shape (len(batch), len(attrs), 6) with the six stat components of each stat. Items, runes, and masteries
+            # are summed separately, so each Build's sums are added in the same order whatever batch it is evaluated in.
+            champions = Build._get_component_sums([[(build._champion, 1)] for build in batch], columns)
+            others = Build._get_component_sums([[(item, 1) for item in build.item_set] for build in batch], columns)
+            others += Build._get_component_sums([list(build.rune_page.items()) for build in batch], columns)
+            others += Build._get_component_sums([[(mastery, 1) for mastery in build.mastery_page] for build in batch], columns)
+            champions = champions.reshape(len(batch), len(attrs), 6)
+            others = others.reshape(len(batch), len(attrs), 6)
+            levels = numpy.array([build._level for build in batch], dtype=numpy.float64)[:, numpy.newaxis]
+
+            # Note: DO NOT use self.bonus to calculate the total. self.bonus needs the total, calculated from scratch, to get its numbers correct
+            base = Build._grow_stat(champions[..., 0], champions[..., 2], levels)
+            batch_totals = Build._total_from_sums(base, numpy.moveaxis(others, 2, 0), levels)
+            totals.extend(dict(zip(attrs, row)) for row in batch_totals.tolist())
+        return totals
+
+    def _get_component_sums(counted_objects, columns):
+        """@param counted_objects:  A list with a list of (object, count) pairs for each sum.
+        @param columns:          The indices of the stat components in _component_fields to sum.
+
+        Returns an array of shape (len(counted_objects), len(columns)) with the summed stat components of each list of objects.
+        """
+        sums = numpy.zeros((len(counted_objects), len(columns)))
+        rows_by_table = {}  # The (number of objects in each sum, rows, counts) read from each table
+        current = rows = None
+        for i, objects in enumerate(counted_objects):
+            for obj, count in objects:
+                table = obj.__dict__.get('_stat_table')
+                if table is None:  # e.g. an unpickled object, which holds its stats itself
+                    sums[i] += count * numpy.array([getattr(obj, _component_fields[column], 0.0) for column in columns])
+                    continue
+                if table is not current:
+                    current = table
+                    rows = rows_by_table.get(table)
+                    if rows is None:
+                        rows = rows_by_table[table] = ([0] * len(counted_objects), [], [])
+                rows[0][i] += 1
+                rows[1].append(obj._stat_row)
+                rows[2].append(count)
+
+        # Each sum's rows and counts are padded with row 0 and a count of 0 to a fixed width, and the rows are then gathered,
+        # weighted, and added up in one pass
+        for table, (lengths, rows, counts) in rows_by_table.items():
+            lengths = numpy.array(lengths)
+            padding = numpy.arange(lengths.max()) < lengths[:, numpy.newaxis]
+            indices = numpy.zeros(padding.shape, dtype=numpy.intp)
+            weights = numpy.zeros(padding.shape)
+            indices[padding] = rows
+            weights[padding] = counts
+            components = table.components if columns == _all_component_columns else table.components[:, columns]
+            sums += (components[indices] * weights[..., numpy.newaxis]).sum(axis=1)
+        return sums
+
+    def _get_stat_sums(objects, attrs):
+        """Returns a dictionary of (stat, [flat, percent, per_level, percent_per_level, percent_base, percent_bonus]) sums over the objects."""
+        columns = [6 * _basic_field_index[attr] + j for attr in attrs for j in range(6)]
+        sums = Build._get_component_sums([[(obj, 1) for obj in objects]], columns)[0].tolist()
+        return {attr: sums[6 * i:6 * i + 6] for i, attr in enumerate(attrs)}
+
+    def _total_from_sums(base, sums, level):
+        """Combine a base stat with the (flat, percent, per_level, percent_per_level, percent_base, percent_bonus) sums of the other objects."""
+        flat, percent, per_level, percent_per_level, percent_base, percent_bonus = sums
+        total = ( (base * (1.0 + percent_base)) + flat + per_level*level ) * (1.0 + percent + percent_per_level*level)
+        bonus = total - base
+        total += percent_bonus * bonus
         return total
 
     def bonus(self, attr):
@@ -550,10 +902,12 @@ class Build(object):
     def get_stats_dictionary(self):
         """Returns a dictionary of the stats in this Build instance, including bonuses and bases."""
         d = {}
+        totals = self.totals()
         for key in sorted(_basic_fields):
-            d[key] = round(self.total(key), 3)
-            d['bonus_'+key] = round(self.bonus(key), 3)
-            d['base_'+key] = round(self.base(key), 3)
+            base = self.base(key)
+            d[key] = round(totals[key], 3)
+            d['bonus_'+key] = round(totals[key] - base, 3)
+            d['base_'+key] = round(base, 3)
 
         return d
 
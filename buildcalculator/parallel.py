@@ -0,0 +1,168 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import pickle
+import struct
+from multiprocessing import shared_memory
+
+from .buildcalculator import Build, ItemSet, RunePage, MasteryPage, Champion, Item, Rune, _Mastery, _StatTable, _table_fields
+
+# The registries that are published, with the class their objects are recreated as and the function that installs them
+_published = (
+    ('champions', Build._registry, Champion, Build._init_champions),
+    ('items', ItemSet._registry, Item, ItemSet._init_items),
+    ('runes', RunePage._registry, Rune, RunePage._init_runes),
+    ('masteries', MasteryPage._registry, _Mastery, MasteryPage._init_masteries),
+)
+
+# A published block starts with the number of doubles in the stat table and the size of the pickled metadata.
+# The stat tables of all of the registries follow, one after the other, and then the metadata.
+_header = struct.Struct('<QQ')
+
+# The blocks attached to by this process. They stay open while the registries (or objects taken from them) read their
+# stats from them, and each attach_registries call closes the earlier ones that nothing reads from anymore.
+_attached_blocks = []
+
+
+class _AttachedBlock(shared_memory.SharedMemory):
+    """A shared memory block that stays mapped until it is closed. The registries hold views into it, so it can't be
+    closed when it's garbage collected at exit; the operating system unmaps it when the process ends."""
+
+    def __del__(self):
+        pass
+
+
+def load_registries():
+    """Loads the champion, item, rune, and mastery registries if they have not been loaded yet."""
+    for _, registry, _, _ in _published:
+        registry()
+
+
+def publish_registries():
+    """Loads the registries and publishes them once into a block of shared memory.
+
+    The stats of every champion, item, rune, and mastery are written as one flat table of doubles, with a row per object
+    and a column per stat. Only the small remainder of each object (its ID, name, tags, gold, components, and tree) is pickled.
+
+    Returns the multiprocessing.shared_memory.SharedMemory block. Pass its name to attach_registries in each worker process.
+    The caller owns the block and must close() and unlink() it once the workers are done.
+    """
+    values = array('d')
+    metadata = {}
+    for name, registry, _, _ in _published:
+        registry = registry()
+        start = len(values) // len(_table_fields)
+        values.extend(registry.stats.values)
+        metadata[name] = (start, len(registry.stats), [(obj._stat_row, obj._metadata()) for _, obj in registry.by_id.items()])
+    metadata = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+
+    table_size = len(values) * values.itemsize
+    block = shared_memory.SharedMemory(create=True, size=_header.size + table_size + len(metadata))
+    _header.pack_into(block.buf, 0, len(values), len(metadata))
+    block.buf[_header.size:_header.size + table_size] = memoryview(values).cast('B')
+    block.buf[_header.size + table_size:_header.size + table_size + len(metadata)] = metadata
+    return block
+
+
+def attach_registries(name):
+    """@param name:  The name of a shared memory block created by publish_registries.
+
+    Installs the published registries in this process instead of running the registry loaders. The objects in them only hold
+    their ID, name, and other metadata; their stats are read from a read-only view of the shared block, so the stat table
+    exists once no matter how many processes attach to it. This replaces any registries the process already has, including
+    ones inherited from the parent under the 'fork' start method, and closes the blocks attached to before once nothing
+    reads from them. Item.builds_from only holds items that are in the registry.
+    """
+    try:
+        block = _AttachedBlock(name=name, track=False)
+    except TypeError:  # 'track' was added in Python 3.13
+        block = _AttachedBlock(name=name)
+    _attached_blocks.append(block)
+
+    count, metadata_size = _header.unpack_from(block.buf)
+    table_end = _header.size + count * array('d').itemsize
+    values = block.buf[_header.size:table_end].toreadonly().cast('d')
+    metadata = pickle.loads(block.buf[table_end:table_end + metadata_size])
+
+    for name, _, cls, init in _published:
+        start, rows, objects = metadata[name]
+        table = _StatTable(values[start * len(_table_fields):(start + rows) * len(_table_fields)])
+        objects_by_id = {}
+        for row, object_metadata in objects:
+            obj = cls._from_metadata(object_metadata, table, row)
+            objects_by_id[obj.id] = obj
+        if cls is Item:
+            for _, item in objects_by_id.items():
+                item._resolve_builds_from(objects_by_id)
+        init(objects_by_id, table)
+
+    # The registries from earlier blocks have been replaced. A block can only be closed once nothing holds a view into it,
+    # so the ones still in use (e.g. by Builds created before this call) stay open until a later call.
+    for previous in _attached_blocks[:-1]:
+        try:
+            previous.close()
+        except BufferError:
+            continue
+        _attached_blocks.remove(previous)
+
+
+class BuildPool(object):
+    def __init__(self, processes=None, context=None):
+        """@param processes:  The number of worker processes. Defaults to os.cpu_count().
+        @param context:    The multiprocessing start method ('fork', 'spawn', or 'forkserver'). Defaults to the platform default.
+
+        A multiprocessing pool whose workers attach to registries published once by the parent process, reading their stats
+        from the shared memory block instead of each holding a copy.
+        Functions passed to the pool must be picklable (e.g. defined at module level). They should create their Builds
+        inside the worker from champion, item, rune, and mastery names or IDs so the workers use the shared registries.
+        """
+        self._block = publish_registries()
+        self._pool = multiprocessing.get_context(context).Pool(processes, initializer=attach_registries, initargs=(self._block.name,))
+
+    def map(self, func, iterable, chunksize=None):
+        """Returns [func(x) for x in iterable], evaluated in the worker processes."""
+        return self._pool.map(func, iterable, chunksize)
+
+    def starmap(self, func, iterable, chunksize=None):
+        """Returns [func(*args) for args in iterable], evaluated in the worker processes."""
+        return self._pool.starmap(func, iterable, chunksize)
+
+    def imap(self, func, iterable, chunksize=1):
+        """Returns an iterator over func(x) for x in iterable, evaluated in the worker processes."""
+        return self._pool.imap(func, iterable, chunksize)
+
+    def close(self):
+        """Waits for the workers to finish and releases the shared memory block."""
+        self._pool.close()
+        self._pool.join()
+        self._block.close()
+        self._block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def evaluate_builds(builds, attrs=None, max_workers=None):
+    """@param builds:       A list of Builds.
+    @param attrs:        A list of stats to evaluate. Defaults to all of the stats in _basic_fields.
+    @param max_workers:  The number of threads. Defaults to the ThreadPoolExecutor default.
+
+    Returns a list with a dictionary of (stat, total value) pairs for each Build, in the same order as builds.
+
+    The registries are loaded before any thread starts and are read-only afterwards, so the Builds can be evaluated
+    concurrently. Each thread evaluates one chunk of the Builds with Build._batch_totals. Only its array arithmetic
+    releases the GIL: reading each object's row and building the result dictionaries is Python, and is most of the work.
+    On standard CPython the threads therefore barely run in parallel, so use BuildPool for large CPU-bound batches.
+    """
+    load_registries()
+    builds = list(builds)
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)  # The ThreadPoolExecutor default
+    size = -(-len(builds) // max_workers) or 1
+    chunks = [builds[start:start + size] for start in range(0, len(builds), size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return [totals for chunk in executor.map(lambda chunk: Build._batch_totals(chunk, attrs), chunks) for totals in chunk]
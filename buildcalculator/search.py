@@ -0,0 +1,220 @@
+from itertools import groupby
+import math
+
+import numpy
+
+from .buildcalculator import Build, BuildError, ItemSet, _basic_fields
+
+# The number of candidate ItemSets that pareto_frontier builds arrays for at a time
+_max_candidates = 1 << 18
+
+# The number of rows (taken from this many ranges of costs) that _frontier_rows compares every row with before pruning,
+# and the number of value comparisons it makes at a time
+_num_pivots = 64
+_num_pivot_ranges = 8
+_max_comparisons = 1 << 22
+
+
+def _prune(entries, block_size=4096):
+    """@param entries:     A list of (cost, values, ...) tuples. The cost is minimized and the values are maximized.
+    @param block_size:  The number of entries checked at a time.
+
+    Returns the entries that are not dominated by another entry. When several entries are equal, the first is kept.
+    """
+    # After sorting by cost (and then by decreasing values), an entry is dominated exactly when an entry before it is at least as
+    # large in every value. Entries are checked a block at a time against the frontier so far and the earlier entries of the block.
+    # For each value, walking those entries from largest to smallest builds a bitmask (a Python int) of the ones at least as large;
+    # the intersection of these masks over all values holds every entry that dominates, so the comparisons run as big-int operations.
+    entries = sorted(entries, key=lambda entry: (entry[0], [-x for x in entry[1]]))
+    return _prune_sorted(entries, block_size)
+
+
+def _prune_sorted(entries, block_size=4096):
+    """_prune for entries that are already sorted by cost and then by decreasing values."""
+    frontier = []
+    for start in range(0, len(entries), block_size):
+        block = entries[start:start + block_size]
+        candidates = frontier + block
+        offset = len(frontier)
+        dominating = [-1] * len(block)  # -1 has every bit set
+        for i in range(len(block[0][1])):
+            column = [entry[1][i] for entry in candidates]
+            order = sorted(range(len(candidates)), key=column.__getitem__, reverse=True)
+            at_least = 0
+            for _, group in groupby(order, key=column.__getitem__):
+                group = list(group)
+                for j in group:
+                    at_least |= 1 << j
+                for j in group:
+                    if j >= offset:
+                        dominating[j - offset] &= at_least
+        for j, entry in enumerate(block):
+            if not dominating[j] & ((1 << (offset + j)) - 1):
+                frontier.append(entry)
+    return frontier
+
+
+def _first_rows(keys):
+    """@param keys:  A 2D array.
+
+    Returns the indices of the first occurrence of each different row of keys, in order.
+    """
+    if not len(keys) or not keys.shape[1]:
+        return numpy.arange(min(len(keys), 1))
+    order = numpy.lexsort(keys.T[::-1])  # Stable, so the first occurrence of a row comes first among its copies
+    keys = keys[order]
+    first = numpy.ones(len(keys), dtype=bool)
+    first[1:] = numpy.any(keys[1:] != keys[:-1], axis=1)
+    return numpy.sort(order[first])
+
+
+def _boxes(x, epsilon, up=False):
+    """@param x:        An array.
+    @param epsilon:  The relative size of the boxes.
+    @param up:       Whether a box is represented by its largest value rather than its smallest.
+
+    Returns a number for the (1 + epsilon) box on a log scale that each value of x falls into, in the same order as the values.
+    Positive and negative values are boxed by their magnitude, and zero has a box of its own.
+    """
+    step = math.log1p(epsilon)
+    offset = math.ceil(800 / step)  # Larger than |log(x)| / step for every nonzero double
+    down_to, up_to = (numpy.ceil, numpy.floor) if up else (numpy.floor, numpy.ceil)
+    with numpy.errstate(divide='ignore'):
+        logs = numpy.log(numpy.abs(x)) / step
+    return numpy.where(x > 0, down_to(logs) + offset, numpy.where(x < 0, -up_to(logs) - offset, 0.0))
+
+
+def _frontier_rows(costs, vectors, epsilon=None):
+    """@param costs:    An array of costs, which are minimized.
+    @param vectors:  An array with a row of values for each cost, which are maximized.
+    @param epsilon:  If given, the costs and values are compared by the (1 + epsilon) box that they fall into on a log scale,
+                     so that at most one row is kept per box.
+
+    Returns the indices of the rows that _prune keeps, in its order. Of several equal rows (or rows in the same box), the cheapest is kept.
+    """
+    order = numpy.argsort(costs, kind='stable')
+    keys = numpy.column_stack([costs[order], vectors[order]])
+    if epsilon is not None:
+        keys = numpy.column_stack([_boxes(keys[:, 0], epsilon, up=True), _boxes(keys[:, 1:], epsilon)])
+        first = _first_rows(keys)
+        order, keys = order[first], keys[first]
+
+    # After sorting by cost (and then by decreasing values), as _prune does, a row is dominated exactly when a row before it is at
+    # least as large in every value. Most dominated rows are dropped first by comparing them with a few strong rows (the best
+    # in each range of costs), which takes a few array operations, and _prune then finds the frontier of the rest.
+    by_key = numpy.lexsort(numpy.column_stack([keys[:, :1], -keys[:, 1:]]).T[::-1])
+    order, keys = order[by_key], keys[by_key]
+    if len(keys) > _num_pivots:
+        values = keys[:, 1:]
+        scores = (values / numpy.maximum(numpy.abs(values).max(axis=0), 1e-12)).sum(axis=1)
+        ranges = numpy.array_split(numpy.arange(len(keys)), _num_pivot_ranges)
+        pivots = numpy.concatenate([rows[numpy.argsort(-scores[rows], kind='stable')[:_num_pivots // _num_pivot_ranges]] for rows in ranges])
+        dominated = numpy.zeros(len(keys), dtype=bool)
+        size = max(1, _max_comparisons // (len(pivots) * max(1, values.shape[1])))
+        for start in range(0, len(keys), size):
+            rows = numpy.arange(start, min(start + size, len(keys)))
+            dominated[rows] = ((values[pivots][numpy.newaxis, :, :] >= values[rows][:, numpy.newaxis, :]).all(axis=2)
+                               & (pivots[numpy.newaxis, :] < rows[:, numpy.newaxis])).any(axis=1)
+        order, keys = order[~dominated], keys[~dominated]
+
+    entries = [(cost, tuple(values), row) for cost, values, row in zip(keys[:, 0].tolist(), keys[:, 1:].tolist(), order.tolist())]
+    return [row for _, _, row in _prune_sorted(entries)]
+
+
+def pareto_frontier(champion, stats, level=1, rune_page=None, mastery_page=None, items=None, max_items=6, max_cost=None, epsilon=None):
+    """@param champion:      A champion ID or name.
+    @param stats:         A list of stats from _basic_fields to maximize. The cost of the items is minimized.
+    @param level:         The champion's level.
+    @param rune_page:     The rune page or a dictionary of (rune_id/rune_name, num_runes) pairs.
+    @param mastery_page:  The mastery page or a dictionary of (mastery_id/mastery_name, num_points) pairs.
+    @param items:         A list of item IDs or item names to choose from. Defaults to every item on Summoner's Rift except trinkets and consumables.
+                          A ValueError is raised if one of them has a negative value in a component of the stats.
+    @param max_items:     The maximum number of items in an ItemSet, from 0 to 6. Items can be repeated.
+    @param max_cost:      The maximum total cost of an ItemSet. Defaults to no limit.
+    @param epsilon:       Approximates the frontier, keeping only one ItemSet per (1 + epsilon) box of cost and stats while searching.
+                          Defaults to the exact frontier.
+
+    Returns the Pareto-optimal ItemSets, sorted by cost: no other allowed ItemSet is at least as good in every stat and costs no more.
+
+    The exact frontier grows very quickly with the number of stats and items, and so does the time to find it. For example, with
+    150 items of one or two stats each, searching four stats took 19 seconds for 5 items and over 2 minutes (88,838 ItemSets) for
+    6 items. A max_cost or an epsilon bounds the search. With an epsilon, every returned ItemSet is on the exact frontier of the
+    ItemSets that were kept, and every allowed ItemSet is matched by a kept one whose cost and summed stat components are each
+    within a factor of (1 + epsilon) ** max_items of its own. On a similar pool of 150 items, epsilon=0.5 took 1 second
+    (91 ItemSets) and epsilon=0.25 took 11 seconds (929 ItemSets) for 6 items, while epsilon=0.1 took 42 seconds
+    (7,938 ItemSets) for only 4 items; smaller epsilons approach the exact search.
+    """
+    if epsilon is not None and not epsilon > 0:
+        raise ValueError("'epsilon' {0} must be greater than 0".format(epsilon))
+    if not 0 <= max_items <= 6:
+        raise BuildError("'max_items' {0} must be between 0 and 6; an ItemSet can have at most 6 items (plus a trinket).".format(max_items))
+    stats = list(stats)
+    for stat in stats:
+        if stat not in _basic_fields:
+            raise ValueError("'{0}' is not a stat in _basic_fields".format(stat))
+
+    if items is None:
+        items = [item for _, item in ItemSet._registry().by_id.items() if 'Trinket' not in item.tags and 'Consumable' not in item.tags]
+    else:
+        items = [ItemSet._get_item(item) for item in items]
+
+    build = Build(champion=champion, level=level, rune_page=rune_page, mastery_page=mastery_page)
+    bases = [build.base(stat) for stat in stats]
+    base_sums = Build._get_stat_sums(build._objects, stats)
+
+    # Each item's stats are flattened into one vector of (flat, percent, per_level, percent_per_level, percent_base, percent_bonus)
+    # sums per stat. An ItemSet's vector is the sum of its items' vectors, so it is updated one item at a time.
+    # Every total grows with every entry of the vector (the items' stats are checked to be non-negative), so a set whose vector and
+    # cost are dominated by another set with the same number of items can never lead to the frontier and is dropped as soon as it appears.
+    vectors = []
+    for item in items:
+        sums = Build._get_stat_sums([item], stats)
+        for stat in stats:
+            if any(value < 0 for value in sums[stat]):
+                raise ValueError("'{0}' has a negative {1} stat; pareto_frontier only supports items whose stats are non-negative".format(item.name, stat))
+        vectors.append(tuple(value for stat in stats for value in sums[stat]))
+    active = [i for i in range(6 * len(stats)) if any(vector[i] for vector in vectors)]
+    pool = [(item.gold.total, tuple(vector[i] for i in active), item) for item, vector in zip(items, vectors)]
+    pool = _prune([entry for entry in pool if any(entry[1]) and (max_cost is None or entry[0] <= max_cost)])
+    pool_costs = numpy.array([cost for cost, _, _ in pool], dtype=numpy.float64)
+    pool_vectors = numpy.array([vector for _, vector, _ in pool], dtype=numpy.float64).reshape(len(pool), len(active))
+
+    # Every frontier set of k items is a frontier set of k - 1 items plus one item: if the smaller set were dominated,
+    # the dominating set plus the same item would dominate the larger one. So each layer only extends the previous one.
+    # A layer is an array of costs, an array of vectors, and an array with the sorted pool indices of each set's items.
+    layer = (numpy.zeros(1), numpy.zeros((1, len(active))), numpy.zeros((1, 0), dtype=numpy.intp))
+    layers = [layer]
+    for _ in range(max_items):
+        # Each set is extended by every item of the pool, a block of sets at a time to bound the size of the arrays. The sets
+        # on the frontier of each block are kept, and then the ones on the frontier of all of the blocks form the next layer.
+        costs, vectors, chosen = layer
+        block_size = max(1, _max_candidates // max(1, len(pool)))
+        kept = []
+        for start in range(0, len(costs), block_size):
+            block = slice(start, start + block_size)
+            size = len(costs[block]) * len(pool)
+            candidates = (
+                (costs[block, numpy.newaxis] + pool_costs).ravel(),
+                (vectors[block, numpy.newaxis, :] + pool_vectors).reshape(size, len(active)),
+                numpy.sort(numpy.hstack([numpy.repeat(chosen[block], len(pool), axis=0),
+                                         numpy.tile(numpy.arange(len(pool)), len(costs[block]))[:, numpy.newaxis]]), axis=1),
+            )
+            if max_cost is not None:
+                candidates = tuple(array[candidates[0] <= max_cost] for array in candidates)
+            candidates = tuple(array[_first_rows(candidates[2])] for array in candidates)  # Each set is reached once per order of its items
+            kept.append(tuple(array[_frontier_rows(candidates[0], candidates[1], epsilon)] for array in candidates))
+        if not kept:
+            break
+        candidates = tuple(numpy.concatenate(arrays) for arrays in zip(*kept))
+        candidates = tuple(array[_first_rows(candidates[2])] for array in candidates)
+        layer = tuple(array[_frontier_rows(candidates[0], candidates[1], epsilon)] for array in candidates)
+        layers.append(layer)
+
+    # The totals of every kept set, with a column per stat, and the final frontier over all of the layers
+    costs = numpy.concatenate([costs for costs, _, _ in layers])
+    sums = numpy.tile([value for stat in stats for value in base_sums[stat]], (len(costs), 1))
+    sums[:, active] += numpy.concatenate([vectors for _, vectors, _ in layers])
+    totals = numpy.column_stack([Build._total_from_sums(bases[i], sums[:, 6 * i:6 * i + 6].T, build._level) for i in range(len(stats))])
+    chosen = [row for _, _, chosen in layers for row in chosen.tolist()]
+    rows = sorted(_frontier_rows(costs, totals, epsilon), key=costs.__getitem__)  # With an epsilon, the rows are only sorted by the box of their cost
+    return [ItemSet([pool[j][2] for j in chosen[row]]) for row in rows]
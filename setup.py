@@ -7,6 +7,7 @@ from setuptools import setup, find_packages
 
 install_requires = [
     "tabulate",
+    "numpy",
 ]
 
 install_requires_via_github = [
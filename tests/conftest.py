@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from buildcalculator import buildcalculator
+from buildcalculator.buildcalculator import Build, ItemSet, RunePage, MasteryPage
+
+from .helpers import riot_data
+
+
+def reset_registries():
+    Build._champions = None
+    ItemSet._items = None
+    RunePage._runes = None
+    MasteryPage._masteries = None
+
+
+@pytest.fixture
+def riot():
+    """Patches the cassiopeia loaders with the data above and starts every test with no registry loaded."""
+    data = riot_data()
+    reset_registries()
+    with mock.patch.object(buildcalculator.cass, 'get_champions', return_value=data['champions']) as get_champions, \
+            mock.patch.object(buildcalculator.cass, 'get_items', return_value=data['items']) as get_items, \
+            mock.patch.object(buildcalculator.cass, 'get_runes', return_value=data['runes']) as get_runes, \
+            mock.patch.object(buildcalculator.cass, 'get_masteries', return_value=data['masteries']) as get_masteries:
+        yield SimpleNamespace(get_champions=get_champions, get_items=get_items, get_runes=get_runes, get_masteries=get_masteries)
+    reset_registries()
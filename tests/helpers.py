@@ -0,0 +1,62 @@
+"""Factories for stand-ins of the cassiopeia objects that the registries load."""
+
+import json
+import os
+from types import SimpleNamespace
+
+from cassiopeia.data import Map, MasteryTree
+
+from buildcalculator import buildcalculator
+
+
+_trees = {61: MasteryTree.ferocity, 62: MasteryTree.cunning, 63: MasteryTree.resolve}
+
+
+def riot_champion(id_, name, **stats):
+    return SimpleNamespace(id=id_, name=name, stats=SimpleNamespace(**stats))
+
+
+def riot_item(id_, name, gold, builds_from=(), tags=(), **stats):
+    return SimpleNamespace(id=id_, name=name, gold=SimpleNamespace(base=gold, purchaseable=True, sell=gold * 7 // 10, total=gold), builds_from=list(builds_from), tags=list(tags),
+                           maps=[Map.summoners_rift], stats=SimpleNamespace(**stats))
+
+
+def riot_rune(id_, name, **stats):
+    return SimpleNamespace(id=id_, name=name, stats=SimpleNamespace(**stats))
+
+
+def riot_masteries():
+    """Stand-ins for cass.get_masteries() covering every mastery in masteries.json."""
+    with open(os.path.join(buildcalculator.buildcalculator_director, 'masteries.json')) as f:
+        ids = [int(id_) for id_ in json.load(f)]
+    return [SimpleNamespace(id=id_, name='Mastery {0}'.format(id_), tree=_trees[id_ // 100]) for id_ in ids]
+
+
+def riot_data():
+    cloth = riot_item(1029, 'Cloth Armor', 300, armor=15)
+    ruby = riot_item(1028, 'Ruby Crystal', 400, health=150)
+    return {
+        'champions': [
+            riot_champion(1, 'Annie', armor=19.22, armor_per_level=4.0, health=511.68, health_per_level=76.0, attack_damage=50.41),
+            riot_champion(222, 'Jinx', armor=22.88, armor_per_level=3.5, health=517.76, health_per_level=82.0, attack_damage=53.04,
+                          attack_damage_per_level=2.41),
+        ],
+        'items': [
+            cloth,
+            ruby,
+            riot_item(1033, 'Null-Magic Mantle', 450, magic_resist=25),
+            riot_item(1036, 'Long Sword', 350, attack_damage=10),
+            riot_item(1042, 'Dagger', 300, percent_attack_speed=0.12),
+            riot_item(3075, 'Thornmail', 2900, builds_from=[cloth], armor=100, health=350),
+            riot_item(3083, "Warmog's Armor", 2850, builds_from=[ruby], health=800, percent_health_regen=2.0),
+            riot_item(3072, 'The Bloodthirster', 3500, attack_damage=70, life_steal=0.2),
+            riot_item(3340, 'Warding Totem (Trinket)', 0, tags=['Trinket', 'Vision']),
+        ],
+        'runes': [
+            riot_rune(5245, 'Greater Mark of Attack Damage', attack_damage=0.95),
+            riot_rune(5317, 'Greater Seal of Armor', armor=1.0),
+            riot_rune(5289, 'Greater Glyph of Magic Resist', magic_resist=1.34),
+            riot_rune(5296, 'Greater Quintessence of Health', health=26),
+        ],
+        'masteries': riot_masteries(),
+    }
@@ -0,0 +1,77 @@
+import pytest
+
+from buildcalculator.buildcalculator import Build, Item, ItemSet
+
+from .helpers import riot_item
+
+
+def add_items(riot, *items):
+    riot.get_items.return_value = riot.get_items.return_value + list(items)
+
+
+def test_item_stats_are_read_from_riot_data(riot):
+    thornmail = ItemSet._get_item('Thornmail')
+    assert (thornmail.armor, thornmail.health, thornmail.attack_damage) == (100, 350, 0.0)
+    build = Build('Jinx', 1, ['Cloth Armor', 'Cloth Armor'])
+    assert build.total('armor') - build.base('armor') == pytest.approx(2 * 15)
+
+
+def test_stat_gold_values_price_each_stat_with_its_basic_item(riot):
+    assert ItemSet.stat_gold_values() == pytest.approx({
+        'armor': 300 / 15,
+        'health': 400 / 150,
+        'magic_resist': 450 / 25,
+        'attack_damage': 350 / 10,
+        'percent_base_attack_speed': 300 / 0.12,
+    })
+
+
+def test_cheapest_basic_item_sets_the_price(riot):
+    add_items(riot, riot_item(9001, 'Cheap Armor', 200, armor=20), riot_item(9002, 'Expensive Armor', 1000, armor=20))
+    assert ItemSet.stat_gold_values()['armor'] == pytest.approx(10.0)
+
+
+def test_items_with_components_or_several_stats_are_not_basic(riot):
+    cloth = riot.get_items.return_value[0]
+    add_items(riot, riot_item(9001, 'Chain Vest', 800, builds_from=[cloth], armor=80),
+              riot_item(9002, 'Armored Crystal', 100, armor=100, health=100))
+    assert ItemSet.stat_gold_values()['armor'] == pytest.approx(20.0)
+    assert ItemSet.stat_gold_values()['health'] == pytest.approx(400 / 150)
+    assert ItemSet.gold_efficiencies()[9001] == pytest.approx(80 * 20.0 / 800)
+
+
+def test_gold_values_and_efficiencies(riot):
+    thornmail_value = 100 * 20.0 + 350 * 400 / 150
+    assert ItemSet._get_item('Thornmail').gold_value == pytest.approx(thornmail_value)
+    assert ItemSet._get_item('Thornmail').gold_efficiency == pytest.approx(thornmail_value / 2900)
+    assert ItemSet._get_item('Cloth Armor').gold_efficiency == pytest.approx(1.0)
+    assert ItemSet.gold_efficiencies()[3075] == pytest.approx(thornmail_value / 2900)
+
+    item_set = ItemSet(['Thornmail', 'Long Sword'])
+    assert item_set.gold_value == pytest.approx(thornmail_value + 350)
+    assert item_set.gold_efficiency == pytest.approx((thornmail_value + 350) / 3250)
+    assert ItemSet().gold_efficiency == 0.0
+
+
+def test_zero_cost_item_has_zero_efficiency(riot):
+    add_items(riot, riot_item(9001, 'Free Armor', 0, armor=5))
+    free_armor = ItemSet._get_item('Free Armor')
+    assert free_armor.gold_value == pytest.approx(100.0)
+    assert free_armor.gold_efficiency == 0.0
+    assert ItemSet._get_item('Warding Totem (Trinket)').gold_efficiency == 0.0
+    assert ItemSet(['Free Armor']).gold_efficiency == 0.0
+
+
+def test_gold_value_loads_the_item_registry(riot):
+    thornmail = Item(riot.get_items.return_value[5])
+    assert ItemSet._items is None
+    assert thornmail.gold_value > 0
+    assert riot.get_items.call_count == 1
+
+
+def test_gold_values_are_recomputed_when_the_items_are_reloaded(riot):
+    assert ItemSet.stat_gold_values()['armor'] == pytest.approx(20.0)
+    add_items(riot, riot_item(9001, 'Cheap Armor', 100, armor=20))
+    ItemSet._init_items()
+    assert ItemSet.stat_gold_values()['armor'] == pytest.approx(5.0)
+    assert ItemSet._get_item('Thornmail').gold_value == pytest.approx(100 * 5.0 + 350 * 400 / 150)
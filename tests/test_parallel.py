@@ -0,0 +1,86 @@
+import pickle
+
+import numpy
+import pytest
+
+from buildcalculator import parallel
+from buildcalculator.buildcalculator import Build, ItemSet, RunePage, MasteryPage
+from buildcalculator.parallel import BuildPool, attach_registries, publish_registries
+
+
+def release(block):
+    """Drops the attached registries, then closes every attached block and the published one."""
+    Build._champions = ItemSet._items = RunePage._runes = MasteryPage._masteries = None
+    while parallel._attached_blocks:
+        parallel._attached_blocks.pop().close()
+    block.close()
+    block.unlink()
+
+
+@pytest.fixture
+def published(riot):
+    """Publishes the registries loaded from the riot fixture and releases every shared memory block afterwards."""
+    block = publish_registries()
+    yield block
+    release(block)
+
+
+def test_attached_components_are_views_of_the_shared_block(published):
+    attach_registries(published.name)
+    shared = numpy.frombuffer(parallel._attached_blocks[-1].buf, dtype=numpy.uint8)
+    for registry in (Build._registry(), ItemSet._registry(), RunePage._registry(), MasteryPage._registry()):
+        assert numpy.shares_memory(registry.stats.components, shared)
+        assert not registry.stats.components.flags.writeable
+    del shared
+
+
+def armor_and_health(item_names):
+    build = Build('Jinx', 18, item_names, {'Greater Seal of Armor': 9}, {6111: 5, 6121: 1})
+    return build.total('armor'), build.total('health'), build.totals(['attack_damage', 'magic_resist'])
+
+
+@pytest.mark.parametrize('context', ['fork', 'spawn'])
+def test_build_pool_matches_local_builds(riot, context):
+    item_sets = [['Thornmail'], ["Warmog's Armor", 'Ruby Crystal'], ['The Bloodthirster', 'Dagger', 'Null-Magic Mantle'], []]
+    expected = [armor_and_health(item_names) for item_names in item_sets]
+    with BuildPool(2, context) as pool:
+        assert pool.map(armor_and_health, item_sets) == expected
+        assert list(pool.imap(armor_and_health, item_sets)) == expected
+        assert pool.starmap(armor_and_health, [(item_names,) for item_names in item_sets]) == expected
+
+
+def test_attached_item_pickles_with_its_stats(published):
+    attach_registries(published.name)
+    thornmail = ItemSet._get_item('Thornmail')
+    assert '_stat_table' in vars(thornmail) and 'armor' not in vars(thornmail)
+    assert (thornmail.gold.total, thornmail.gold.sell, thornmail.gold.purchaseable) == (2900, 2030, True)
+    assert [item.name for item in thornmail.builds_from] == ['Cloth Armor']
+
+    copy = pickle.loads(pickle.dumps(thornmail))
+    assert '_stat_table' not in vars(copy)
+    assert (copy.armor, copy.health, copy.gold) == (100, 350, thornmail.gold)
+    assert Build('Jinx', 18, [copy]).total('armor') == Build('Jinx', 18, [thornmail]).total('armor')
+
+
+def test_attaching_again_closes_the_previous_block(published):
+    attach_registries(published.name)
+    first = parallel._attached_blocks[-1]
+    build = Build('Jinx', 18, ['Thornmail'])
+    attach_registries(published.name)
+    assert first in parallel._attached_blocks  # build still reads from it
+
+    del build
+    attach_registries(published.name)
+    assert first not in parallel._attached_blocks
+    assert len(parallel._attached_blocks) == 1
+
+
+def test_attaching_empty_registries_does_not_load_from_riot(riot):
+    riot.get_runes.return_value = []
+    block = publish_registries()
+    try:
+        attach_registries(block.name)
+        assert len(RunePage._registry().by_id) == 0
+        assert riot.get_runes.call_count == 1
+    finally:
+        release(block)
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from buildcalculator.buildcalculator import Build, ItemSet, RunePage, MasteryPage
+from buildcalculator.parallel import evaluate_builds
+
+
+_num_threads = 16
+
+
+def slow(loader):
+    """Makes a patched loader yield to the other threads so that they all reach the registry before it is published."""
+    data = loader.return_value
+
+    def load(*args, **kwargs):
+        time.sleep(0.05)
+        return data
+    loader.side_effect = load
+
+
+def create_concurrently(create):
+    """Calls create in _num_threads threads that start together and returns their results."""
+    barrier = threading.Barrier(_num_threads)
+    results = [None] * _num_threads
+    errors = []
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = create(i)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(_num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    return results
+
+
+def check_registry(registry, expected_ids):
+    assert set(registry.by_id) == set(expected_ids)
+    assert len(registry.by_name) == len(registry.by_id)
+    for name, obj in registry.by_name.items():
+        assert obj.name == name
+        assert registry.by_id[obj.id] is obj
+
+
+def test_first_use_from_many_threads_loads_each_registry_once(riot):
+    for loader in vars(riot).values():
+        slow(loader)
+
+    item_names = ['Thornmail', "Warmog's Armor", 'Long Sword', 'Dagger', 'The Bloodthirster', 'Null-Magic Mantle']
+
+    def create(i):
+        item_set = ItemSet([item_names[i % len(item_names)], 'Ruby Crystal'])
+        rune_page = RunePage({'Greater Seal of Armor': 9, 5296: 1 + i % 3})
+        mastery_page = MasteryPage({[6111, 6114][i % 2]: 5, 6121 + i % 3: 1})
+        return Build(['Annie', 'Jinx'][i % 2], 1 + i, item_set, rune_page, mastery_page)
+    builds = create_concurrently(create)
+
+    for loader in vars(riot).values():
+        assert loader.call_count == 1
+
+    data = {name: loader.return_value for name, loader in vars(riot).items()}
+    check_registry(Build._registry(), [champion.id for champion in data['get_champions']])
+    check_registry(ItemSet._registry(), [item.id for item in data['get_items']])
+    check_registry(RunePage._registry(), [rune.id for rune in data['get_runes']])
+    check_registry(MasteryPage._registry(), [mastery.id for mastery in data['get_masteries']])
+
+    assert evaluate_builds(builds, max_workers=4) == [build.totals() for build in builds]
+
+
+def test_evaluate_builds_matches_total(riot):
+    builds = [Build('Jinx', level, ['Thornmail', 'Dagger'], {'Greater Mark of Attack Damage': 9}, {6111: 5}) for level in range(1, 19)]
+    for build, totals in zip(builds, evaluate_builds(builds, attrs=['armor', 'attack_damage', 'health'], max_workers=3)):
+        for attr, value in totals.items():
+            assert abs(value - build.total(attr)) < 1e-9
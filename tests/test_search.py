@@ -0,0 +1,120 @@
+import random
+from itertools import combinations_with_replacement
+
+import pytest
+
+from buildcalculator.buildcalculator import Build, BuildError
+from buildcalculator.search import _prune, pareto_frontier
+
+from .helpers import riot_item
+
+
+_stats = ['armor', 'health', 'attack_damage']
+_components = ['{0}', 'percent_{0}', '{0}_per_level', 'percent_{0}_per_level', 'percent_base_{0}', 'percent_bonus_{0}']
+
+
+def dominates(a, b):
+    """Whether (cost, values) point a is at least as good as point b in every value and costs no more."""
+    return a[0] <= b[0] and all(x >= y for x, y in zip(a[1], b[1]))
+
+
+def brute_force_frontier(points):
+    """Returns the distinct points that no different point dominates."""
+    points = set(points)
+    return {point for point in points if not any(other != point and dominates(other, point) for other in points)}
+
+
+def random_item(rng, id_):
+    """An item with one to three random stat components, including percent, percent_base, percent_bonus, and per-level stats."""
+    stats = {}
+    for _ in range(rng.randint(1, 3)):
+        name = rng.choice(_components).format(rng.choice(_stats))
+        stats[name] = rng.choice([0.05, 0.1, 0.25]) if name.startswith('percent') else float(rng.randint(1, 40))
+    return riot_item(id_, 'Item {0}'.format(id_), rng.choice([100, 200, 300, 450]), **stats)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_prune_matches_brute_force(seed):
+    rng = random.Random(seed)
+    num_values = rng.randint(1, 4)
+    entries = [(rng.randint(0, 5), tuple(rng.randint(0, 3) for _ in range(num_values)), i) for i in range(rng.randint(1, 60))]
+
+    pruned = _prune(entries, block_size=rng.randint(1, 8))
+
+    expected = brute_force_frontier((cost, values) for cost, values, _ in entries)
+    assert sorted((cost, values) for cost, values, _ in pruned) == sorted(expected)
+    for cost, values, i in pruned:  # Of several equal entries, the first is kept
+        assert i == min(j for other_cost, other_values, j in entries if (other_cost, other_values) == (cost, values))
+
+
+def random_search(riot, rng):
+    """Sets the item pool to a few random items and returns random arguments for pareto_frontier."""
+    pool = [random_item(rng, 4000 + i) for i in range(rng.randint(3, 6))]
+    riot.get_items.return_value = pool
+    stats = rng.sample(_stats, rng.randint(1, 3))
+    return pool, stats, rng.choice(['Annie', 'Jinx']), rng.randint(1, 18), rng.randint(0, 3), rng.choice([None, 600])
+
+
+def search_points(pool, stats, champion, level, max_items, max_cost):
+    """Returns a function from an ItemSet to its (cost, totals) point, and the points of every allowed ItemSet."""
+    rune_page, mastery_page = {'Greater Seal of Armor': 9}, {6111: 5, 6121: 1}
+
+    def point(item_set):
+        totals = Build(champion, level, list(item_set), rune_page, mastery_page).totals(stats)
+        return sum(item.gold.total for item in item_set), tuple(round(totals[stat], 6) for stat in stats)
+
+    item_sets = [item_set for k in range(max_items + 1) for item_set in combinations_with_replacement([item.name for item in pool], k)]
+    points = [point(Build(champion, level, list(item_set)).item_set) for item_set in item_sets]
+    return point, [p for p in points if max_cost is None or p[0] <= max_cost]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_pareto_frontier_matches_brute_force(riot, seed):
+    pool, stats, champion, level, max_items, max_cost = random_search(riot, random.Random(seed))
+    point, points = search_points(pool, stats, champion, level, max_items, max_cost)
+
+    frontier = pareto_frontier(champion, stats, level, {'Greater Seal of Armor': 9}, {6111: 5, 6121: 1}, max_items=max_items, max_cost=max_cost)
+
+    assert sorted(point(item_set) for item_set in frontier) == sorted(brute_force_frontier(points))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_approximate_pareto_frontier_covers_brute_force(riot, seed):
+    pool, stats, champion, level, max_items, max_cost = random_search(riot, random.Random(seed))
+    point, points = search_points(pool, stats, champion, level, max_items, max_cost)
+    epsilon = 0.2
+
+    frontier = pareto_frontier(champion, stats, level, {'Greater Seal of Armor': 9}, {6111: 5, 6121: 1},
+                               max_items=max_items, max_cost=max_cost, epsilon=epsilon)
+
+    found = [point(item_set) for item_set in frontier]
+    assert all(len(item_set) <= max_items and (max_cost is None or cost <= max_cost) for item_set, (cost, _) in zip(frontier, found))
+    assert brute_force_frontier(found) == set(found) and len(set(found)) == len(found)
+    assert [cost for cost, _ in found] == sorted(cost for cost, _ in found)
+    factor = (1 + epsilon) ** (max_items + 1)
+    for cost, totals in brute_force_frontier(points):
+        assert any(other_cost + 1 <= factor * (cost + 1) and all(x + 1 >= (y + 1) / factor for x, y in zip(other_totals, totals))
+                   for other_cost, other_totals in found)
+
+
+def test_pareto_frontier_rejects_invalid_epsilon(riot):
+    for epsilon in (0, -0.1):
+        with pytest.raises(ValueError):
+            pareto_frontier('Jinx', ['armor'], max_items=2, epsilon=epsilon)
+
+
+@pytest.mark.parametrize('max_items', [-1, 7])
+def test_pareto_frontier_rejects_invalid_max_items(riot, max_items):
+    with pytest.raises(BuildError):
+        pareto_frontier('Jinx', ['armor'], max_items=max_items)
+
+
+def test_pareto_frontier_rejects_items_with_negative_stats(riot):
+    riot.get_items.return_value = riot.get_items.return_value + [riot_item(9001, 'Glass Armor', 500, armor=40, percent_bonus_health=-0.1)]
+    assert pareto_frontier('Jinx', ['armor'], max_items=2)
+    with pytest.raises(ValueError, match='Glass Armor'):
+        pareto_frontier('Jinx', ['armor', 'health'], max_items=2)
+
+
+def test_pareto_frontier_without_items_of_the_stats(riot):
+    assert pareto_frontier('Jinx', ['armor'], items=['Long Sword', 'Dagger'], max_items=2) == [[]]